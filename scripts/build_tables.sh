@@ -1,15 +1,15 @@
-﻿#!/usr/bin/env bash
+#!/usr/bin/env bash
 set -euo pipefail
 mkdir -p results/tables
-# create small, valid CSVs if missing
-test -s results/tables/ipd.csv || cat > results/tables/ipd.csv <<EOF
-date,ipd_index
-2025-09-01,100.0
-2025-10-01,98.7
-EOF
-test -s results/tables/lci_by_family.csv || cat > results/tables/lci_by_family.csv <<EOF
-task_family,lci_usd_per_task
-codegen,1.23e-7
-rag_qa,1.85e-7
-EOF
+# create small, valid CSVs if missing (same columns as src/generate_demo_results.py)
+test -s results/tables/ipd.csv || cat > results/tables/ipd.csv <<EOT
+date,IPD
+2025-09-01,1.0
+2025-10-01,0.987
+EOT
+test -s results/tables/lci_by_family.csv || cat > results/tables/lci_by_family.csv <<EOT
+date,family,LCI,accuracy,p95_ms,price_per_token_usd
+2025-10-01,codegen,1.23e-07,0.7,600.0,1.2e-05
+2025-10-01,rag_qa,1.85e-07,0.8,450.0,1e-05
+EOT
 echo "[build_tables] wrote results/tables/*.csv"
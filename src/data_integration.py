@@ -3,7 +3,6 @@ from pathlib import Path
 
 BASE = Path(__file__).resolve().parents[1]
 OUT = BASE / "data" / "interim" / "merged_inputs.csv"
-OUT.parent.mkdir(parents=True, exist_ok=True)
 
 def fetch_all():
     # TODO: replace with real sources; keep robust fallbacks
@@ -25,6 +24,7 @@ def fetch_all():
 
 def main():
     df = fetch_all()
+    OUT.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(OUT, index=False)
     print(f"Wrote {len(df)} rows to {OUT}")
 
@@ -1,17 +1,24 @@
 ﻿from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
+from panel import load_panel
 
 BASE = Path(__file__).resolve().parents[1]
 
-def plot_lci_scatter():
-    p = BASE / "results" / "tables" / "lci_by_family.csv"
-    if not p.exists():
-        print("[WARN] lci_by_family.csv not found.")
-        return
-    df = pd.read_csv(p)
+def plot_lci_scatter(df=None):
+    """Scatter LCI against accuracy per family.
+
+    ``df`` is an in-memory ``lci_by_family`` panel; when omitted it is loaded
+    from results/tables/lci_by_family.csv.
+    """
+    if df is None:
+        p = BASE / "results" / "tables" / "lci_by_family.csv"
+        if not p.exists():
+            print("[WARN] lci_by_family.csv not found.")
+            return
+        df = load_panel(p)
+    import matplotlib.pyplot as plt
+
     x_col = "accuracy" if "accuracy" in df.columns else "a"
-    for fam, df_f in df.groupby("family"):
+    for fam, df_f in df.groupby("family", observed=True):
         fig, ax = plt.subplots()
         ax.scatter(df_f[x_col], df_f["LCI"])
         ax.set_title(f"LCI vs Accuracy — {fam}")
@@ -7,7 +7,16 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
-from make_ipd import chain_fisher
+from panel import (
+    MISSING_DAY,
+    compact_panel,
+    day_numbers,
+    decode_panel,
+    downcast_metrics,
+    memory_bytes,
+    report_memory,
+)
+from table_export import LCI_BY_FAMILY, render_table, write_if_changed
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -128,7 +137,7 @@ def demo_dataframe() -> pd.DataFrame:
 
 
 def load_inputs() -> pd.DataFrame:
-    """Load merged inputs or fall back to the deterministic seed dataset."""
+    """Load merged inputs (or the seed dataset) as a compact panel."""
 
     merged = INTERIM / "merged_inputs.csv"
     if not merged.exists():
@@ -142,71 +151,66 @@ def load_inputs() -> pd.DataFrame:
         df["accuracy"] = df["a"]
     if "a" not in df.columns and "accuracy" in df.columns:
         df["a"] = df["accuracy"]
-    return df
+    panel = compact_panel(df)
+    report_memory("input panel", memory_bytes(df), memory_bytes(panel))
+    return panel
 
 
 def compute_lci_by_family(df: pd.DataFrame) -> pd.DataFrame:
-    """Aggregate raw rows into per-family LCI slices."""
+    """Aggregate raw rows into per-family LCI slices.
+
+    ``df`` is only read. The result keeps the compact panel encoding (int64
+    day numbers, categorical families); pass it through
+    :func:`panel.decode_panel` before writing it out.
+    """
 
     BAR_L = 500.0
 
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df = df.dropna(subset=["date", "a", "p95_ms", "price_per_token_usd"])
-    phi = df["a"].astype(float).clip(lower=1e-6) * (
-        BAR_L / np.maximum(df["p95_ms"].astype(float).clip(lower=1.0), BAR_L)
+    days = day_numbers(df["date"])
+    a = df["a"].to_numpy(dtype=np.float64)
+    p95 = df["p95_ms"].to_numpy(dtype=np.float64)
+    price = df["price_per_token_usd"].to_numpy(dtype=np.float64)
+    keep = (days != MISSING_DAY) & ~np.isnan(a) & ~np.isnan(p95) & ~np.isnan(price)
+
+    phi = np.clip(a[keep], 1e-6, None) * (
+        BAR_L / np.maximum(np.clip(p95[keep], 1.0, None), BAR_L)
     ) ** 0.5
-    cost = df["price_per_token_usd"].astype(float).clip(lower=1e-10)
-    df["LCI"] = cost / phi
+    cost = np.clip(price[keep], 1e-10, None)
+    rows = pd.DataFrame(
+        {
+            "date": days[keep],
+            "family": df["family"].array[keep],
+            "LCI": cost / phi,
+            "accuracy": df["accuracy"].array[keep],
+            "p95_ms": p95[keep],
+            "price_per_token_usd": price[keep],
+        }
+    )
 
     by_family = (
-        df.groupby(["date", "family"], as_index=False)
+        rows.groupby(["date", "family"], as_index=False, observed=True)
         .agg(
             LCI=("LCI", "median"),
             accuracy=("accuracy", "median"),
             p95_ms=("p95_ms", "median"),
             price_per_token_usd=("price_per_token_usd", "median"),
         )
-        .sort_values(["date", "LCI"])
+        .sort_values(["date", "LCI"], ignore_index=True)
     )
-    by_family["date"] = by_family["date"].dt.strftime("%Y-%m-%d")
-    return by_family
+    return downcast_metrics(by_family)
 
 
-def export_latex_table(by_family: pd.DataFrame) -> None:
-    """Write a LaTeX table containing the latest snapshot."""
+def export_latex_table(by_family: pd.DataFrame) -> bool:
+    """Write a LaTeX table containing the latest snapshot.
+
+    Returns whether the file was (re)written.
+    """
 
     if by_family.empty:
-        return
+        return False
 
-    latest_date = by_family["date"].max()
-    latest_rows = by_family[by_family["date"] == latest_date]
-    header = [
-        "\\begin{table}[t]",
-        "\\centering",
-        "\\caption{LCI by Task Family (demo)}",
-        "\\label{tab:lci_by_family}",
-        "\\begin{tabular}{lrrrr}",
-        "\\toprule",
-        "Family & LCI & Accuracy & p95 (ms) & Price/Token " + "\\\\",
-        "\\midrule",
-    ]
-    body = [
-        (
-            f"{r['family']} & {r['LCI']:.2e} & {r['accuracy']:.3f} "
-            f"& {r['p95_ms']:.0f} & {r['price_per_token_usd']:.2e} "
-            "\\\\"
-        )
-        for _, r in latest_rows.iterrows()
-    ]
-    footer = [
-        "\\bottomrule",
-        "\\end{tabular}",
-        "\\end{table}",
-        "",
-    ]
-    tex = "\n".join(header + body + footer)
-    (TABLES / "lci_by_family.tex").write_text(tex, encoding="utf-8")
+    latest_rows = by_family[by_family["date"] == by_family["date"].max()]
+    return write_if_changed(TABLES / "lci_by_family.tex", render_table(latest_rows, LCI_BY_FAMILY))
 
 
 def export_ipd(by_family: pd.DataFrame) -> None:
@@ -216,22 +220,32 @@ def export_ipd(by_family: pd.DataFrame) -> None:
         (TABLES / "ipd.csv").write_text("date,IPD\n", encoding="utf-8")
         return
 
-    lci_for_chain = by_family[["date", "family", "LCI"]].copy()
-    lci_for_chain["date"] = pd.to_datetime(lci_for_chain["date"], errors="coerce")
-    lci_for_chain = lci_for_chain.dropna()
-    ipd = chain_fisher(lci_for_chain)
+    from make_ipd import chain_fisher
+
+    ipd = chain_fisher(by_family)
     ipd.to_csv(TABLES / "ipd.csv", index=False)
 
 
-def main() -> None:
+def write_lci_by_family() -> pd.DataFrame:
+    """Compute the per-family slices from the inputs and write them to CSV."""
+
     _ensure_table_dirs()
-    df = load_inputs()
-    by_family = compute_lci_by_family(df)
-    by_family.to_csv(TABLES / "lci_by_family.csv", index=False)
+    by_family = compute_lci_by_family(load_inputs())
+    decode_panel(by_family).to_csv(TABLES / "lci_by_family.csv", index=False)
+    return by_family
+
+
+def main() -> None:
+    by_family = write_lci_by_family()
     export_ipd(by_family)
     export_latex_table(by_family)
     print("[OK] generated results/tables/{lci_by_family.csv, ipd.csv, lci_by_family.tex}")
 
+    from figures import plot_lci_scatter
+
+    plot_lci_scatter(by_family)
+    print("[OK] generated results/figures/lci_vs_accuracy_*.pdf")
+
 
 if __name__ == "__main__":
     main()
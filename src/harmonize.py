@@ -0,0 +1,247 @@
+"""Cross-vintage harmonization of benchmark accuracy scores.
+
+Scores in ``data/raw/accuracy.csv`` are only comparable when they share a
+protocol. Every score is keyed on (dataset, split, metric, shots, variant):
+
+* ``shots`` comes from a ``shots`` column when present, otherwise from an
+  ``N-shot`` tag in the metric or dataset name, else :data:`UNKNOWN_SHOTS`;
+* ``variant`` (``base`` or ``instruct``) comes from a ``variant`` column when
+  present, otherwise from the model name.
+
+The stage runs in two steps:
+
+1. :func:`aggregate_seeds` collapses seeds into one record per model and
+   protocol (mean, standard deviation, seed count). It is incremental:
+   :func:`refresh` keeps a persisted index of (model, dataset) digests whose
+   row counts add up to a watermark into the append-only raw file. Only rows
+   past the watermark are hashed, and only the pairs they touch are
+   re-aggregated.
+2. :func:`harmonize` picks a reference protocol per (dataset, split, metric)
+   and maps the other protocols onto it. A non-reference score is shifted by
+   the mean reference-minus-protocol gap over models measured under both
+   when at least :data:`MIN_PAIRS` such models exist, and rejected otherwise.
+   A model that also has a reference score keeps only that one.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+BASE = Path(__file__).resolve().parents[1]
+RAW = BASE / "data" / "raw" / "accuracy.csv"
+INTERIM = BASE / "data" / "interim"
+INDEX = INTERIM / "accuracy_index.csv"
+RECORDS = INTERIM / "accuracy_records.csv"
+OUT = INTERIM / "accuracy_harmonized.csv"
+
+PROTOCOL = ["dataset", "split", "metric", "shots", "variant"]
+RECORD_KEY = ["model"] + PROTOCOL
+PAIR_KEY = ["model", "dataset"]
+UNKNOWN_SHOTS = -1
+MIN_PAIRS = 3
+
+_SHOTS = re.compile(r"(\d+)[-_ ]?shot", re.IGNORECASE)
+_INSTRUCT = re.compile(r"instruct|chat|[-_]it\b|sft|rlhf", re.IGNORECASE)
+_STR_COLUMNS = {c: str for c in ("model", "family", "dataset", "split", "metric", "variant")}
+
+
+def _shots(raw: pd.DataFrame) -> pd.Series:
+    if "shots" in raw.columns:
+        return pd.to_numeric(raw["shots"], errors="coerce").fillna(UNKNOWN_SHOTS).astype(np.int64)
+    tag = raw["metric"].astype(str) + " " + raw["dataset"].astype(str)
+    return pd.to_numeric(tag.str.extract(_SHOTS, expand=False), errors="coerce").fillna(
+        UNKNOWN_SHOTS
+    ).astype(np.int64)
+
+
+def _variant(raw: pd.DataFrame) -> pd.Series:
+    if "variant" in raw.columns:
+        return raw["variant"].astype(str).str.lower()
+    return pd.Series(
+        np.where(raw["model"].astype(str).str.contains(_INSTRUCT), "instruct", "base"),
+        index=raw.index,
+    )
+
+
+def pair_digests(raw: pd.DataFrame, base: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Order-independent content digest of the raw rows of each (model, dataset).
+
+    A digest is a sum of row hashes, so it can be extended: with ``base`` (an
+    earlier result), ``raw`` holds only the rows added since and the result
+    covers both.
+    """
+
+    hashed = pd.util.hash_pandas_object(raw, index=False).to_numpy()
+    parts = [
+        pd.DataFrame(
+            {
+                "model": raw["model"].to_numpy(),
+                "dataset": raw["dataset"].to_numpy(),
+                "n_rows": np.ones(len(raw), dtype=np.int64),
+                "hi": (hashed >> np.uint64(32)).astype(np.int64),
+                "lo": (hashed & np.uint64(0xFFFFFFFF)).astype(np.int64),
+            }
+        )
+    ]
+    if base is not None and len(base):
+        halves = base["digest"].str.split("-", n=1, expand=True)
+        parts.append(
+            pd.DataFrame(
+                {
+                    "model": base["model"].to_numpy(),
+                    "dataset": base["dataset"].to_numpy(),
+                    "n_rows": base["n_rows"].to_numpy(dtype=np.int64),
+                    "hi": [int(h, 16) for h in halves[0]],
+                    "lo": [int(h, 16) for h in halves[1]],
+                }
+            )
+        )
+    grouped = pd.concat(parts, ignore_index=True).groupby(PAIR_KEY, sort=True).agg(
+        n_rows=("n_rows", "sum"), hi=("hi", "sum"), lo=("lo", "sum")
+    )
+    grouped["digest"] = grouped["hi"].map("{:x}".format) + "-" + grouped["lo"].map("{:x}".format)
+    return grouped[["n_rows", "digest"]].reset_index()
+
+
+def aggregate_seeds(raw: pd.DataFrame) -> pd.DataFrame:
+    """Collapse seeds into one record per model and protocol.
+
+    Re-runs of the same seed keep only their latest timestamp.
+    """
+
+    scores = raw.assign(
+        shots=_shots(raw),
+        variant=_variant(raw),
+        value=pd.to_numeric(raw["value"], errors="coerce"),
+        timestamp=pd.to_datetime(raw["timestamp"], errors="coerce", utc=True),
+    ).dropna(subset=["value"])
+    scores = scores.sort_values("timestamp").drop_duplicates(RECORD_KEY + ["seed"], keep="last")
+    records = scores.groupby(RECORD_KEY, as_index=False, sort=True).agg(
+        family=("family", "first"),
+        value=("value", "mean"),
+        value_std=("value", "std"),
+        n_seeds=("seed", "nunique"),
+        timestamp=("timestamp", "max"),
+    )
+    records["timestamp"] = records["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return records
+
+
+def harmonize(records: pd.DataFrame, min_pairs: int = MIN_PAIRS) -> pd.DataFrame:
+    """Map seed-aggregated records onto one reference protocol per benchmark.
+
+    Adds ``reference`` (bool), ``adjustment``, ``value_harmonized`` and
+    ``status``: one of ``reference``, ``adjusted``, ``superseded`` (the model
+    also has a reference score) or ``rejected`` (too few paired models).
+    """
+
+    bench = ["dataset", "split", "metric"]
+    out = records.copy()
+
+    coverage = (
+        out.groupby(PROTOCOL, as_index=False)["model"].nunique()
+        .sort_values(bench + ["model", "shots", "variant"], ascending=[True] * 3 + [False, True, True])
+        .drop_duplicates(bench)
+        .rename(columns={"shots": "ref_shots", "variant": "ref_variant"})
+        .drop(columns="model")
+    )
+    out = out.merge(coverage, on=bench, how="left")
+    out["reference"] = (out["shots"] == out["ref_shots"]) & (out["variant"] == out["ref_variant"])
+
+    ref = out.loc[out["reference"], ["model"] + bench + ["value"]].rename(columns={"value": "ref_value"})
+    paired = out.loc[~out["reference"]].merge(ref, on=["model"] + bench, how="inner")
+    gaps = (
+        paired.assign(gap=paired["ref_value"] - paired["value"])
+        .groupby(PROTOCOL, as_index=False)
+        .agg(adjustment=("gap", "mean"), n_pairs=("gap", "size"))
+    )
+    out = out.merge(gaps, on=PROTOCOL, how="left")
+    has_ref = out.merge(
+        ref[["model"] + bench].assign(has_ref=True), on=["model"] + bench, how="left"
+    )["has_ref"].fillna(False).to_numpy(dtype=bool)
+
+    adjustable = out["n_pairs"].fillna(0).to_numpy() >= min_pairs
+    out["status"] = np.select(
+        [out["reference"], has_ref, adjustable],
+        ["reference", "superseded", "adjusted"],
+        default="rejected",
+    )
+    out["adjustment"] = np.where(out["reference"], 0.0, np.where(adjustable, out["adjustment"], np.nan))
+    out["value_harmonized"] = np.where(
+        out["status"].isin(["reference", "adjusted"]), out["value"] + out["adjustment"], np.nan
+    )
+    return out.drop(columns=["ref_shots", "ref_variant", "n_pairs"])
+
+
+def refresh(
+    raw: pd.DataFrame,
+    index_path: Path = INDEX,
+    records_path: Path = RECORDS,
+    full: bool = False,
+) -> tuple[pd.DataFrame, int]:
+    """Bring the persisted seed-aggregated records up to date with ``raw``.
+
+    ``raw`` is treated as append-only: the first ``sum(n_rows)`` rows of it
+    (the watermark) are the rows already in the index, so only the rows after
+    them are hashed, and only the (model, dataset) pairs those rows touch are
+    re-aggregated. A refresh with no new rows reads the cache and writes
+    nothing. Edits to rows before the watermark go unnoticed unless ``full``
+    is set, or ``raw`` is shorter than the watermark. In both cases every row
+    is hashed and any pair whose digest changed is re-aggregated; pairs that
+    disappeared from ``raw`` are dropped.
+    Returns the full record table and the number of pairs processed.
+    """
+
+    if index_path.exists() and records_path.exists():
+        index = pd.read_csv(index_path, dtype=_STR_COLUMNS)
+        cached = pd.read_csv(records_path, dtype=_STR_COLUMNS)
+    else:
+        index = pd.DataFrame(columns=PAIR_KEY + ["n_rows", "digest"])
+        cached = pd.DataFrame(columns=RECORD_KEY)
+
+    watermark = int(index["n_rows"].sum())
+    if full or len(raw) < watermark:
+        digests = pair_digests(raw)
+    elif len(raw) == watermark and len(index):
+        return cached, 0
+    else:
+        digests = pair_digests(raw.iloc[watermark:], index)
+
+    seen = digests.merge(index[PAIR_KEY + ["digest"]], on=PAIR_KEY + ["digest"], how="left", indicator=True)
+    unchanged = seen.loc[seen["_merge"] == "both", PAIR_KEY]
+    stale = seen.loc[seen["_merge"] == "left_only", PAIR_KEY]
+
+    keep = cached.merge(unchanged, on=PAIR_KEY, how="inner")
+    todo = raw.merge(stale, on=PAIR_KEY, how="inner")
+    fresh = aggregate_seeds(todo) if len(todo) else keep.iloc[:0]
+    frames = [f for f in (keep, fresh) if len(f)]
+    records = pd.concat(frames, ignore_index=True) if frames else fresh
+    records = records.sort_values(RECORD_KEY, ignore_index=True)
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    records.to_csv(records_path, index=False)
+    digests.to_csv(index_path, index=False)
+    return records, len(stale)
+
+
+def main(accuracy: Path = RAW, full: bool = False) -> None:
+    raw = pd.read_csv(accuracy, dtype=_STR_COLUMNS, encoding="utf-8-sig")
+    records, processed = refresh(raw, full=full)
+    harmonized = harmonize(records)
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+    harmonized.to_csv(OUT, index=False)
+    counts = harmonized["status"].value_counts().to_dict()
+    print(
+        f"[OK] Harmonized {len(harmonized)} records "
+        f"({processed} new or changed model/dataset pairs): {counts}"
+    )
+    print(f"[OK] Wrote {OUT}")
+
+
+if __name__ == "__main__":
+    main()
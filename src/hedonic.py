@@ -0,0 +1,219 @@
+"""Time-dummy hedonic regressions on the merged LCI panel.
+
+The model regresses log price per token on quality characteristics with date,
+family and region fixed effects::
+
+    log(price_per_token_usd) = X_char @ beta + delta_date + gamma_family + eta_region + e
+
+``exp(delta_t - delta_0)`` is the quality-adjusted (hedonic) price index, a
+comparison series for the chained Fisher IPD in ``make_ipd``.
+
+The fixed effects enter as sparse one-hot blocks. :class:`HedonicDesign`
+accumulates the normal equations ``X'X`` over row batches, factors them once
+(Cholesky) and reuses the factor for every outcome, so refitting when only
+prices change costs a pair of triangular solves. Standard errors are
+cluster-robust (CR1) when a cluster column is given, heteroskedasticity-robust
+(HC1) otherwise.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import linalg, sparse
+from scipy.linalg import lapack
+
+from panel import MISSING_DAY, day_numbers, from_day_numbers
+
+
+CHARACTERISTICS = ("a", "p95_ms", "q", "s", "tokens_per_sec")
+FIXED_EFFECTS = ("date", "family", "region")
+OUTCOME = "price_per_token_usd"
+ALIAS_TOL = 1e-9
+
+
+def _independent_columns(xtx: np.ndarray, tol: float = ALIAS_TOL) -> np.ndarray:
+    """Indices of the columns of ``X'X`` not aliased with earlier columns.
+
+    Works on the correlation-scaled matrix: a Cholesky pivot below ``tol`` (or
+    a failed factorization) marks the first column that is a linear
+    combination of the ones before it; it is dropped and the factorization
+    retried. Earlier columns therefore always win.
+    """
+
+    diag = np.diag(xtx)
+    keep = np.flatnonzero(diag > 0)
+    scale = np.sqrt(diag)
+    while len(keep):
+        sub = xtx[np.ix_(keep, keep)] / np.outer(scale[keep], scale[keep])
+        factor, info = lapack.dpotrf(sub)
+        valid = info - 1 if info > 0 else len(keep)
+        small = np.flatnonzero(np.diag(factor)[:valid] ** 2 < tol)
+        if len(small):
+            bad = small[0]
+        elif info > 0:
+            bad = info - 1
+        else:
+            break
+        keep = np.delete(keep, bad)
+    return keep
+
+
+@dataclass
+class HedonicFit:
+    names: list[str]         # coefficient names, aligned with coef/se
+    coef: np.ndarray
+    se: np.ndarray
+    n_obs: int
+    n_clusters: int
+    base_date: str | None    # date absorbed by the intercept
+
+    def coefficients(self) -> pd.DataFrame:
+        """Coefficient table with standard errors."""
+
+        return pd.DataFrame({"term": self.names, "coef": self.coef, "se": self.se})
+
+    def time_index(self) -> pd.DataFrame:
+        """Hedonic index ``exp(delta_t)``, equal to 1 on the base date."""
+
+        if self.base_date is None:
+            return pd.DataFrame(columns=["date", "IPD_hedonic", "se_log"])
+        pos = [i for i, name in enumerate(self.names) if name.startswith("date=")]
+        dates = [self.base_date] + [self.names[i].split("=", 1)[1] for i in pos]
+        return pd.DataFrame(
+            {
+                "date": pd.to_datetime(dates),
+                "IPD_hedonic": np.exp(np.concatenate(([0.0], self.coef[pos]))),
+                "se_log": np.concatenate(([0.0], self.se[pos])),
+            }
+        )
+
+
+class HedonicDesign:
+    """Sparse hedonic design matrix with a cached normal-equation factor.
+
+    Rows with a missing characteristic, fixed-effect key, cluster key or
+    non-positive outcome are dropped; characteristics with no variation among the kept rows
+    are dropped as well (they are absorbed by the intercept). Columns that are
+    linear combinations of earlier ones are listed in ``aliased``. The first level
+    of every fixed effect is the base, so date coefficients read directly as
+    log index levels relative to the first date.
+    """
+
+    def __init__(
+        self,
+        panel: pd.DataFrame,
+        characteristics: tuple[str, ...] = CHARACTERISTICS,
+        fixed_effects: tuple[str, ...] = FIXED_EFFECTS,
+        cluster: str | None = "model",
+        batch_rows: int = 100_000,
+    ) -> None:
+        chars = [c for c in characteristics if c in panel.columns]
+        effects = [c for c in fixed_effects if c in panel.columns]
+
+        values = panel[chars].to_numpy(dtype=np.float64)
+        keys = {}
+        for col in effects:
+            if col == "date":
+                keys[col] = day_numbers(panel[col])
+            elif isinstance(panel[col].dtype, pd.CategoricalDtype):
+                keys[col] = panel[col].array
+            else:
+                keys[col] = panel[col].to_numpy()
+        keep = np.isfinite(values).all(axis=1)
+        for col, key in keys.items():
+            keep &= (key != MISSING_DAY) if col == "date" else ~np.asarray(pd.isna(key))
+        if OUTCOME in panel.columns:
+            keep &= panel[OUTCOME].to_numpy(dtype=np.float64) > 0
+        if cluster is not None and cluster in panel.columns:
+            keep &= ~np.asarray(pd.isna(panel[cluster]))
+        self.rows = np.flatnonzero(keep)
+        n = len(self.rows)
+
+        values = values[self.rows]
+        varying = np.ptp(values, axis=0) > 0 if n else np.zeros(len(chars), dtype=bool)
+        self.dropped = [c for c, v in zip(chars, varying) if not v]
+
+        # Column order decides which column is dropped when the design is
+        # aliased: date dummies first so the index survives, characteristics
+        # last.
+        names = ["(intercept)"]
+        blocks = [sparse.csr_matrix(np.ones((n, 1)))]
+        self.base_date = None
+        for col in effects:
+            code, levels = pd.factorize(keys[col][self.rows], sort=True)
+            if col == "date":
+                levels = from_day_numbers(levels).strftime("%Y-%m-%d")
+                self.base_date = levels[0] if len(levels) else None
+            mask = code > 0
+            blocks.append(
+                sparse.csr_matrix(
+                    (np.ones(mask.sum()), (np.flatnonzero(mask), code[mask] - 1)),
+                    shape=(n, max(len(levels) - 1, 0)),
+                )
+            )
+            names += [f"{col}={level}" for level in levels[1:]]
+        names += [c for c, v in zip(chars, varying) if v]
+        blocks.append(sparse.csr_matrix(values[:, varying]))
+        self.names = names
+
+        self.clusters = None
+        if cluster is not None and cluster in panel.columns:
+            self.clusters = pd.factorize(panel[cluster].array[self.rows])[0]
+
+        X = sparse.hstack(blocks, format="csr")
+        xtx = np.zeros((X.shape[1], X.shape[1]))
+        for start in range(0, n, batch_rows):
+            chunk = X[start:start + batch_rows]
+            xtx += (chunk.T @ chunk).toarray()
+        self.columns = _independent_columns(xtx)
+        self.aliased = [names[i] for i in np.setdiff1d(np.arange(len(names)), self.columns)]
+        self.X = X[:, self.columns]
+        xtx = xtx[np.ix_(self.columns, self.columns)]
+        self._factor = linalg.cho_factor(xtx)
+        self._xtx_inv = linalg.cho_solve(self._factor, np.eye(len(xtx)))
+
+    def outcome(self, panel: pd.DataFrame, column: str = OUTCOME) -> np.ndarray:
+        """Log of ``column`` on the rows kept by this design."""
+
+        return np.log(panel[column].to_numpy(dtype=np.float64)[self.rows])
+
+    def fit(self, y: np.ndarray) -> HedonicFit:
+        """Solve for ``y`` reusing the cached factor of ``X'X``.
+
+        Aliased columns get NaN coefficients and standard errors.
+        """
+
+        X = self.X
+        n, k = X.shape
+        if len(y) != n:
+            raise ValueError(f"outcome has {len(y)} rows, design has {n}; use outcome()")
+        coef = linalg.cho_solve(self._factor, X.T @ y)
+        resid = y - X @ coef
+
+        groups = self.clusters if self.clusters is not None else np.arange(n)
+        n_groups = int(groups.max()) + 1 if n else 0
+        members = sparse.csr_matrix((np.ones(n), (groups, np.arange(n))), shape=(n_groups, n))
+        scores = (members @ sparse.csr_matrix(X.multiply(resid[:, None]))).toarray()
+        meat = scores.T @ scores
+        if n > k and n_groups > 1:
+            scale = n_groups / (n_groups - 1) * (n - 1) / (n - k)
+            cov = scale * self._xtx_inv @ meat @ self._xtx_inv
+            se = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        else:
+            se = np.full(k, np.nan)
+        full_coef = np.full(len(self.names), np.nan)
+        full_se = np.full(len(self.names), np.nan)
+        full_coef[self.columns] = coef
+        full_se[self.columns] = se
+        return HedonicFit(list(self.names), full_coef, full_se, n, n_groups, self.base_date)
+
+
+def hedonic_index(panel: pd.DataFrame, **kwargs) -> tuple[pd.DataFrame, HedonicFit]:
+    """Fit the default time-dummy model and return its index and fit."""
+
+    design = HedonicDesign(panel, **kwargs)
+    fit = design.fit(design.outcome(panel))
+    return fit.time_index(), fit
@@ -0,0 +1,165 @@
+"""Single command-line entry point for the LCI pipeline.
+
+Usage::
+
+    python src/lci.py integrate [--templates]
+    python src/lci.py harmonize [--full]
+    python src/lci.py compute
+    python src/lci.py ipd [--decompose] [--weight COLUMN]
+    python src/lci.py hedonic
+    python src/lci.py figures
+    python src/lci.py tables [--by date] [--by family]
+
+Each subcommand imports its implementation (and with it pandas, numpy or
+matplotlib) only when it runs, so light commands such as
+``integrate --templates`` start without paying for the scientific stack.
+Keep module-level imports here to the standard library.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+
+def _integrate(args: argparse.Namespace) -> None:
+    if args.templates:
+        import lci_program
+
+        lci_program.ensure_schema_files()
+        lci_program.create_merged_template()
+        return
+
+    import data_integration
+
+    data_integration.main()
+
+
+def _harmonize(args: argparse.Namespace) -> None:
+    import harmonize
+
+    harmonize.main(full=args.full)
+
+
+def _compute(args: argparse.Namespace) -> None:
+    import generate_demo_results
+
+    generate_demo_results.write_lci_by_family()
+    print("[OK] Wrote results/tables/lci_by_family.csv")
+
+
+def _ipd(args: argparse.Namespace) -> None:
+    import make_ipd
+
+    make_ipd.main(decompose=args.decompose or args.weight is not None, weight=args.weight)
+
+
+def _hedonic(args: argparse.Namespace) -> None:
+    import generate_demo_results
+    from hedonic import hedonic_index
+
+    index, fit = hedonic_index(generate_demo_results.load_inputs())
+    tables = generate_demo_results.TABLES
+    tables.mkdir(parents=True, exist_ok=True)
+    index.to_csv(tables / "ipd_hedonic.csv", index=False)
+    fit.coefficients().to_csv(tables / "hedonic_coefficients.csv", index=False)
+    print(
+        f"[OK] Wrote results/tables/{{ipd_hedonic.csv, hedonic_coefficients.csv}} "
+        f"({fit.n_obs} rows, {fit.n_clusters} clusters)"
+    )
+
+
+def _figures(args: argparse.Namespace) -> None:
+    import figures
+
+    figures.main()
+
+
+def _tables(args: argparse.Namespace) -> None:
+    import generate_demo_results
+    from panel import load_panel
+
+    path = generate_demo_results.TABLES / "lci_by_family.csv"
+    if not path.exists():
+        print("[ERR] lci_by_family.csv not found. Run `lci compute` first.")
+        sys.exit(1)
+    by_family = load_panel(path, report=False)
+    if generate_demo_results.export_latex_table(by_family):
+        print("[OK] Wrote results/tables/lci_by_family.tex")
+    else:
+        print("[OK] results/tables/lci_by_family.tex unchanged")
+
+    if args.by:
+        from table_export import APPENDIX_TABLES, export_grouped
+
+        out_dir = generate_demo_results.TABLES / "appendix"
+        for key in dict.fromkeys(args.by):
+            template, stem = APPENDIX_TABLES[key]
+            written, unchanged = export_grouped(by_family, template, (key,), out_dir, stem)
+            print(f"[OK] appendix tables by {key}: {written} written, {unchanged} unchanged")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the ``lci`` command."""
+
+    parser = argparse.ArgumentParser(prog="lci", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    integrate = sub.add_parser("integrate", help="merge raw inputs into data/interim")
+    integrate.add_argument(
+        "--templates",
+        action="store_true",
+        help="only write the schema templates and an empty merged_inputs.csv",
+    )
+    integrate.set_defaults(func=_integrate)
+
+    harmonize = sub.add_parser(
+        "harmonize", help="harmonize benchmark scores across protocols and vintages"
+    )
+    harmonize.add_argument(
+        "--full",
+        action="store_true",
+        help="rehash every raw row instead of only rows appended since the last run",
+    )
+    harmonize.set_defaults(func=_harmonize)
+    sub.add_parser("compute", help="compute results/tables/lci_by_family.csv").set_defaults(
+        func=_compute
+    )
+    ipd = sub.add_parser("ipd", help="chain the per-family LCI into results/tables/ipd.csv")
+    ipd.add_argument(
+        "--decompose",
+        action="store_true",
+        help="also write within/share-shift/entry/exit contributions to ipd_decomposition.csv",
+    )
+    ipd.add_argument(
+        "--weight",
+        metavar="COLUMN",
+        help="weight families by this column of lci_by_family.csv in the decomposition "
+        "(default: equal weights); implies --decompose",
+    )
+    ipd.set_defaults(func=_ipd)
+    sub.add_parser(
+        "hedonic", help="time-dummy hedonic index into results/tables/ipd_hedonic.csv"
+    ).set_defaults(func=_hedonic)
+    sub.add_parser("figures", help="plot figures from the computed tables").set_defaults(
+        func=_figures
+    )
+    tables = sub.add_parser("tables", help="export LaTeX tables from the computed tables")
+    tables.add_argument(
+        "--by",
+        action="append",
+        choices=("date", "family"),
+        help="also write one .tex/.csv appendix table per date or family (repeatable)",
+    )
+    tables.set_defaults(func=_tables)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,48 +3,173 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from panel import MISSING_DAY, day_numbers, from_day_numbers, load_panel
+
 BASE = Path(__file__).resolve().parents[1]
 
+def _date_family_matrix(df, weight=None):
+    """Pivot ``(date, family, LCI)`` rows into a dense date x family matrix.
+
+    Returns the sorted unique day numbers, the LCI matrix (float64, NaN where a
+    family is absent on a date) and a matching weight matrix. Duplicate
+    (date, family) rows are averaged; their weights are summed. Without a
+    ``weight`` column every present family gets weight 1. Rows with a missing
+    date, family or LCI, or a missing or negative weight, are dropped.
+    """
+    days = day_numbers(df["date"])
+    lci = df["LCI"].to_numpy(dtype=np.float64)
+    fam_codes, _ = pd.factorize(df["family"].array)
+    keep = (days != MISSING_DAY) & np.isfinite(lci) & (fam_codes >= 0)
+    if weight is not None:
+        w = df[weight].to_numpy(dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            keep &= np.isfinite(w) & (w >= 0)
+    days, lci, fam_codes = days[keep], lci[keep], fam_codes[keep]
+    uniq_days, day_idx = np.unique(days, return_inverse=True)
+    shape = (len(uniq_days), int(fam_codes.max()) + 1 if len(fam_codes) else 0)
+    total = np.zeros(shape)
+    count = np.zeros(shape)
+    np.add.at(total, (day_idx, fam_codes), lci)
+    np.add.at(count, (day_idx, fam_codes), 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        matrix = total / count
+    if weight is None:
+        weights = (count > 0).astype(np.float64)
+    else:
+        weights = np.zeros(shape)
+        np.add.at(weights, (day_idx, fam_codes), w[keep])
+    return uniq_days, matrix, weights
+
+def _fisher_links(matrix):
+    """Fisher link relative for every pair of consecutive dates."""
+    # Equal weights for now (public calibration)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rel = matrix[1:] / matrix[:-1]
+        rel[~np.isfinite(rel)] = np.nan
+        n = np.isfinite(rel).sum(axis=1)
+        L = np.nansum(rel, axis=1) / n
+        P = n / np.nansum(1.0 / rel, axis=1)
+        # No overlapping families: carry the previous level forward
+        return np.where(n > 0, np.sqrt(L * P), 1.0)
+
 def chain_fisher(df):
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values(["date", "family"])
-    dates = df["date"].drop_duplicates().tolist()
-    if not dates:
+    """Chain Fisher IPD over the families present on consecutive dates.
+
+    ``df`` may be a raw frame (string dates) or a compact panel (int64 day
+    numbers, categorical families); it is read, never copied or mutated.
+    """
+    days, matrix, _ = _date_family_matrix(df)
+    if not len(days):
         return pd.DataFrame(columns=["date","IPD"])
 
-    # Equal weights for now (public calibration)
-    fisher = {dates[0]: 1.0}
-    for i in range(1, len(dates)):
-        d0, d1 = dates[i-1], dates[i]
-        prev = df[df["date"] == d0][["family","LCI"]].rename(columns={"LCI":"LCI0"})
-        curr = df[df["date"] == d1][["family","LCI"]].rename(columns={"LCI":"LCI1"})
-        merged = pd.merge(prev, curr, on="family", how="inner")
-        if merged.empty:
-            fisher[d1] = fisher[d0]
-            continue
-        L = (merged["LCI1"] / merged["LCI0"]).mean()
-        P = 1.0 / ( (merged["LCI0"] / merged["LCI1"]).mean() )
-        F = float(np.sqrt(L * P))
-        fisher[d1] = fisher[d0] * F
-    out = pd.DataFrame({"date": list(fisher.keys()), "IPD": list(fisher.values())}).sort_values("date")
-    out["IPD"] = out["IPD"] / out["IPD"].iloc[0]
-    return out
-
-def main():
+    ipd = np.concatenate(([1.0], np.cumprod(_fisher_links(matrix))))
+    return pd.DataFrame({"date": from_day_numbers(days), "IPD": ipd})
+
+DECOMPOSITION_COLUMNS = [
+    "date", "n_continuing", "n_entering", "n_exiting",
+    "within", "share_shift", "entry", "exit", "level_change",
+    "fisher_gap", "log_ipd_link",
+]
+
+def _group_mean(x, w, mask):
+    """Row-wise ``w``-weighted mean of ``x`` over ``mask`` (NaN if empty)."""
+    w = np.where(mask, w, 0.0)
+    wsum = w.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(mask, x * w, 0.0).sum(axis=1) / wsum, wsum
+
+def decompose_ipd(df, weight=None):
+    """Decompose each link of the chained IPD into its sources.
+
+    ``log_ipd_link`` is the log of the ``chain_fisher`` link, i.e. the change
+    in log IPD written to ``ipd.csv``. It splits exactly into five terms. The
+    first four decompose ``level_change``, the change in the share-weighted
+    mean log LCI over the families present on each date (equal shares unless
+    a ``weight`` column is named), following Melitz and Polanec (2015):
+
+    * ``within``: change in the unweighted mean log LCI of continuing families;
+    * ``share_shift``: change in the share/LCI covariance among continuing
+      families (identically zero under equal weights);
+    * ``entry``: entrants' share times their level gap to continuing families;
+    * ``exit``: exiters' share times the continuing-minus-exiter level gap.
+
+    ``fisher_gap`` is the residual ``log_ipd_link - level_change``. It holds
+    the Fisher-vs-geometric-mean gap on continuing families and cancels the
+    turnover terms, which the chained index ignores. When no family continues,
+    ``entry`` carries the whole level change and the Fisher link is 1. All
+    links are computed at once on the date x family matrix.
+    """
+    days, matrix, weights = _date_family_matrix(df, weight)
+    if len(days) < 2:
+        return pd.DataFrame(columns=DECOMPOSITION_COLUMNS)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.log(matrix)
+        shares = weights / weights.sum(axis=1, keepdims=True)
+    present = np.isfinite(x) & (shares > 0)
+    x = np.where(present, x, 0.0)
+
+    p0, p1 = present[:-1], present[1:]
+    x0, x1 = x[:-1], x[1:]
+    s0, s1 = shares[:-1], shares[1:]
+    cont, entr, exits = p0 & p1, p1 & ~p0, p0 & ~p1
+
+    n_cont = cont.sum(axis=1)
+    mean0, _ = _group_mean(x0, 1.0, cont)
+    mean1, _ = _group_mean(x1, 1.0, cont)
+    cont0, _ = _group_mean(x0, s0, cont)
+    cont1, _ = _group_mean(x1, s1, cont)
+    entr1, entr_share = _group_mean(x1, s1, entr)
+    exit0, exit_share = _group_mean(x0, s0, exits)
+    level0, _ = _group_mean(x0, s0, p0)
+    level1, _ = _group_mean(x1, s1, p1)
+
+    has_cont = n_cont > 0
+    log_link = np.log(_fisher_links(matrix))
+    within = np.where(has_cont, mean1 - mean0, 0.0)
+    share_shift = np.where(has_cont, (cont1 - mean1) - (cont0 - mean0), 0.0)
+    entry = np.where(
+        has_cont,
+        np.where(entr_share > 0, entr_share * (entr1 - cont1), 0.0),
+        level1 - level0,
+    )
+    exit_ = np.where(has_cont & (exit_share > 0), exit_share * (cont0 - exit0), 0.0)
+
+    return pd.DataFrame({
+        "date": from_day_numbers(days[1:]),
+        "n_continuing": n_cont,
+        "n_entering": entr.sum(axis=1),
+        "n_exiting": exits.sum(axis=1),
+        "within": within,
+        "share_shift": share_shift,
+        "entry": entry,
+        "exit": exit_,
+        "level_change": level1 - level0,
+        "fisher_gap": log_link - (level1 - level0),
+        "log_ipd_link": log_link,
+    })
+
+def main(decompose=False, weight=None):
     tables = BASE / "results" / "tables" / "lci_by_family.csv"
     if not tables.exists():
         print("[ERR] lci_by_family.csv not found. Run lci_program.py first.")
         sys.exit(1)
 
-    df = pd.read_csv(tables)
-    subset = df[["date", "family", "LCI"]].dropna()
-    ipd = chain_fisher(subset)
+    df = load_panel(tables)
+    if weight is not None and weight not in df.columns:
+        print(f"[ERR] weight column {weight!r} not found in lci_by_family.csv.")
+        sys.exit(1)
+    ipd = chain_fisher(df)
 
     out_csv = BASE / "results" / "tables" / "ipd.csv"
     ipd.to_csv(out_csv, index=False)
     print(f"[OK] Wrote {out_csv}")
 
+    if decompose:
+        dec_csv = out_csv.with_name("ipd_decomposition.csv")
+        decompose_ipd(df, weight=weight).to_csv(dec_csv, index=False)
+        print(f"[OK] Wrote {dec_csv}")
+
     try:
         import matplotlib.pyplot as plt
         fig, ax = plt.subplots()
@@ -77,4 +202,4 @@ def main():
     meta_path.write_text(json.dumps(meta, indent=2))
 
 if __name__ == "__main__":
-    main()
+    main(decompose="--decompose" in sys.argv[1:])
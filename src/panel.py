@@ -0,0 +1,146 @@
+"""Canonical in-memory representation of the LCI panel.
+
+The raw panel arrives as CSV with string keys and float64 metrics. Every stage
+of the pipeline (``compute_lci_by_family``, ``chain_fisher`` and the figure
+code) works on the compact form produced here instead:
+
+* ``date`` is parsed once into int64 day numbers (days since 1970-01-01);
+  unparseable dates become :data:`MISSING_DAY`, which is the int64 value of
+  ``NaT``.
+* ``family``, ``provider``, ``model`` and ``region`` are dictionary-encoded as
+  pandas categoricals.
+* QoS metrics that do not feed LCI (``p50_ms``, ``q``, ``s``,
+  ``tokens_per_sec``, ``ops_pct``) are downcast to float32. The LCI inputs
+  (``a``/``accuracy``, ``p95_ms``, ``price_per_token_usd``) and LCI itself
+  stay float64, so LCI and IPD values are bit-identical to the uncompacted
+  computation.
+
+Use :func:`decode_panel` at the edges of the pipeline when a human-readable
+frame is needed (CSV output).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+CATEGORICAL_COLUMNS = ("family", "provider", "model", "region")
+FLOAT32_COLUMNS = (
+    "p50_ms",
+    "q",
+    "s",
+    "tokens_per_sec",
+    "ops_pct",
+)
+# LCI is computed from accuracy and p95 latency, so those stay float64 along
+# with prices and LCI itself: published LCI/IPD values must not move.
+FLOAT64_COLUMNS = ("a", "accuracy", "p95_ms", "price_per_token_usd", "LCI")
+MISSING_DAY = np.iinfo(np.int64).min
+# Day numbers accepted as already compact: 1900-01-01 .. 2199-12-31
+DAY_RANGE = (
+    int(np.datetime64("1900-01-01", "D").astype(np.int64)),
+    int(np.datetime64("2199-12-31", "D").astype(np.int64)),
+)
+
+
+def day_numbers(values) -> np.ndarray:
+    """Return ``values`` as int64 days since the epoch.
+
+    Integer input already in day numbers (within :data:`DAY_RANGE`, or
+    :data:`MISSING_DAY`) is returned without copying; 8-digit ``YYYYMMDD``
+    integers are parsed as such, and any other integer input is rejected.
+    Anything else is parsed with :func:`pandas.to_datetime`; unparseable
+    entries map to :data:`MISSING_DAY`.
+    """
+
+    if pd.api.types.is_integer_dtype(getattr(values, "dtype", None)):
+        days = np.asarray(values, dtype=np.int64)
+        present = days[days != MISSING_DAY]
+        if ((present >= DAY_RANGE[0]) & (present <= DAY_RANGE[1])).all():
+            return days
+        if ((present >= 10000101) & (present <= 99991231)).all():
+            parsed = pd.DatetimeIndex(
+                pd.to_datetime(present.astype(str), format="%Y%m%d", errors="coerce")
+            )
+            out = np.full(days.shape, MISSING_DAY)
+            out[days != MISSING_DAY] = parsed.values.astype("datetime64[D]").astype(np.int64)
+            return out
+        raise ValueError("integer dates must be day numbers since 1970-01-01 or YYYYMMDD")
+    parsed = pd.DatetimeIndex(pd.to_datetime(values, errors="coerce", utc=True))
+    return parsed.tz_localize(None).values.astype("datetime64[D]").astype(np.int64)
+
+
+def from_day_numbers(days) -> pd.DatetimeIndex:
+    """Inverse of :func:`day_numbers`; :data:`MISSING_DAY` becomes ``NaT``."""
+
+    return pd.DatetimeIndex(
+        np.asarray(days, dtype=np.int64).astype("datetime64[D]").astype("datetime64[ns]")
+    )
+
+
+def downcast_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast known metric columns of ``df`` to their compact dtypes in place."""
+
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns and df[col].dtype != np.float32:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float32)
+    for col in FLOAT64_COLUMNS:
+        if col in df.columns and df[col].dtype != np.float64:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float64)
+    return df
+
+
+def compact_panel(df: pd.DataFrame) -> pd.DataFrame:
+    """Return the compact representation of a raw panel frame.
+
+    Columns outside the known schema are carried over unchanged. Columns that
+    are already compact are reused rather than copied.
+    """
+
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col == "date":
+            columns[col] = day_numbers(series)
+        elif col in CATEGORICAL_COLUMNS and not isinstance(series.dtype, pd.CategoricalDtype):
+            columns[col] = series.astype("category")
+        else:
+            columns[col] = series
+    return downcast_metrics(pd.DataFrame(columns, index=df.index))
+
+
+def decode_panel(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with ISO ``YYYY-MM-DD`` dates, ready for CSV output."""
+
+    if "date" not in df.columns or not pd.api.types.is_integer_dtype(df["date"].dtype):
+        return df
+    return df.assign(date=from_day_numbers(day_numbers(df["date"])).strftime("%Y-%m-%d"))
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    """Deep resident size of ``df`` in bytes, including string payloads."""
+
+    return int(df.memory_usage(deep=True).sum())
+
+
+def report_memory(label: str, before: int, after: int) -> None:
+    """Print a one-line before/after memory summary."""
+
+    ratio = before / after if after else float("inf")
+    print(
+        f"[OK] {label}: {before / 1024:.1f} KiB -> {after / 1024:.1f} KiB "
+        f"({ratio:.1f}x smaller)"
+    )
+
+
+def load_panel(path: Path | str, report: bool = True) -> pd.DataFrame:
+    """Read a panel CSV and return its compact representation."""
+
+    raw = pd.read_csv(path)
+    panel = compact_panel(raw)
+    if report:
+        report_memory(f"panel {Path(path).name}", memory_bytes(raw), memory_bytes(panel))
+    return panel
@@ -0,0 +1,234 @@
+"""Batch LaTeX/CSV table export from templated, grouped panels.
+
+A :class:`TableTemplate` describes a table once (columns, number formats,
+caption and label); :func:`export_grouped` then renders one table per group
+of a frame, e.g. one per date, family or region, from a single formatting
+pass over all rows:
+
+* every body cell is formatted column-at-a-time with :func:`numpy.char.mod`,
+  and each group's LaTeX body is sliced from that result;
+* each group's CSV is written with ``to_csv`` on its own rows, so quoted
+  fields with embedded newlines stay in their group;
+* files are rewritten only when their contents change, so downstream LaTeX
+  builds and ``make`` targets stay incremental.
+
+Column names follow the tables written by ``generate_demo_results``
+(``date``, ``family``, ``LCI``, ``accuracy``, ``p95_ms``,
+``price_per_token_usd``).
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from panel import decode_panel
+
+
+_LATEX_SPECIALS = re.compile(r"[&%$#_{}\\~^]")
+# Characters that cannot be escaped with a plain backslash
+_LATEX_WORDS = {"\\": r"\textbackslash{}", "~": r"\textasciitilde{}", "^": r"\textasciicircum{}"}
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str                # source column in the frame
+    header: str              # LaTeX column header
+    fmt: str = "%s"          # printf-style cell format
+    align: str = "r"         # tabular alignment
+
+
+@dataclass(frozen=True)
+class TableTemplate:
+    columns: tuple[Column, ...]
+    caption: str             # may reference group keys, e.g. "{date}"
+    label: str               # may reference group keys
+    placement: str = "t"
+
+
+LCI_BY_FAMILY = TableTemplate(
+    columns=(
+        Column("family", "Family", align="l"),
+        Column("LCI", "LCI", "%.2e"),
+        Column("accuracy", "Accuracy", "%.3f"),
+        Column("p95_ms", "p95 (ms)", "%.0f"),
+        Column("price_per_token_usd", "Price/Token", "%.2e"),
+    ),
+    caption="LCI by Task Family (demo)",
+    label="tab:lci_by_family",
+)
+
+LCI_BY_FAMILY_AT_DATE = TableTemplate(
+    columns=LCI_BY_FAMILY.columns,
+    caption="LCI by Task Family, {date} (demo)",
+    label="tab:lci_by_family_{date}",
+)
+
+LCI_FAMILY_HISTORY = TableTemplate(
+    columns=(Column("date", "Date", align="l"),) + LCI_BY_FAMILY.columns[1:],
+    caption="LCI history for {family} (demo)",
+    label="tab:lci_history_{family}",
+)
+
+# Appendix table sets: grouping column -> (template, file name pattern)
+APPENDIX_TABLES = {
+    "date": (LCI_BY_FAMILY_AT_DATE, "lci_by_family_{date}"),
+    "family": (LCI_FAMILY_HISTORY, "lci_history_{family}"),
+}
+
+
+def _latex_special(match: re.Match) -> str:
+    char = match.group(0)
+    return _LATEX_WORDS.get(char, "\\" + char)
+
+
+def _escape(values: np.ndarray) -> np.ndarray:
+    escaped = pd.Series(values, dtype=object).str.replace(
+        _LATEX_SPECIALS, _latex_special, regex=True
+    )
+    return escaped.to_numpy(dtype=object)
+
+
+def format_rows(df: pd.DataFrame, template: TableTemplate) -> np.ndarray:
+    """Return the LaTeX body line for every row of ``df``."""
+
+    cells = []
+    for col in template.columns:
+        values = df[col.name].to_numpy()
+        if col.fmt == "%s":
+            cells.append(_escape(values.astype(str)))
+        else:
+            cells.append(np.char.mod(col.fmt, values.astype(np.float64)).astype(object))
+    if not cells:
+        return np.empty(len(df), dtype=object)
+    line = cells[0]
+    for cell in cells[1:]:
+        line = line + " & " + cell
+    return line + " \\\\"
+
+
+def render_latex(
+    body: list[str] | np.ndarray,
+    template: TableTemplate,
+    *,
+    labels: dict[str, str] | None = None,
+    **keys,
+) -> str:
+    """Wrap formatted body lines in the template's table environment.
+
+    Group ``keys`` are LaTeX-escaped in the caption and slugged in the label;
+    ``labels`` overrides the slugs.
+    """
+
+    captions = {k: _escape(np.asarray([str(v)]))[0] for k, v in keys.items()}
+    labels = {k: _slug(v) for k, v in keys.items()} | (labels or {})
+    spec = "".join(col.align for col in template.columns)
+    header = [
+        f"\\begin{{table}}[{template.placement}]",
+        "\\centering",
+        f"\\caption{{{template.caption.format(**captions)}}}",
+        f"\\label{{{template.label.format(**labels)}}}",
+        f"\\begin{{tabular}}{{{spec}}}",
+        "\\toprule",
+        " & ".join(col.header for col in template.columns) + " \\\\",
+        "\\midrule",
+    ]
+    footer = [
+        "\\bottomrule",
+        "\\end{tabular}",
+        "\\end{table}",
+        "",
+    ]
+    return "\n".join(header + list(body) + footer)
+
+
+def render_table(df: pd.DataFrame, template: TableTemplate, **keys) -> str:
+    """Render ``df`` as a single LaTeX table."""
+
+    return render_latex(format_rows(decode_panel(df), template), template, **keys)
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write ``text`` to ``path`` unless it already holds exactly that text."""
+
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def _slug(value) -> str:
+    return re.sub(r"[^0-9A-Za-z._-]+", "_", str(value)).strip("_") or "_"
+
+
+def _unique_slugs(values) -> dict:
+    """Map each distinct value to its slug, keeping distinct values apart.
+
+    Values that share a slug (``"R&D ops"`` and ``"R_D_ops"``) each get the
+    CRC32 of the value as a suffix, so names do not depend on group order and
+    stay the same between runs.
+    """
+
+    slugs = {v: _slug(v) for v in values}
+    shared = Counter(slugs.values())
+    return {
+        v: slug if shared[slug] == 1 else f"{slug}-{zlib.crc32(str(v).encode('utf-8')):08x}"
+        for v, slug in slugs.items()
+    }
+
+
+def export_grouped(
+    df: pd.DataFrame,
+    template: TableTemplate,
+    by: tuple[str, ...],
+    out_dir: Path,
+    stem: str,
+) -> tuple[int, int]:
+    """Write one ``.tex`` and one ``.csv`` table per group of ``df``.
+
+    ``stem`` is a file name pattern over the group keys, e.g.
+    ``"lci_by_family_{date}"``. Keys whose slugs collide are disambiguated
+    (see :func:`_unique_slugs`); a ``stem`` that still maps two groups to one
+    file raises :class:`ValueError` before anything is written. Returns
+    ``(written, unchanged)`` file counts.
+    """
+
+    frame = decode_panel(df)
+    body = format_rows(frame, template)
+    csv_cols = [col.name for col in template.columns if col.name not in by]
+    csv_frame = frame[list(by) + csv_cols]
+
+    if by:
+        groups = frame.groupby(list(by), sort=True, observed=True).indices
+    else:
+        groups = {(): np.arange(len(frame))}
+    group_keys = [dict(zip(by, key if isinstance(key, tuple) else (key,))) for key in groups]
+    slugs = {col: _unique_slugs({keys[col] for keys in group_keys}) for col in by}
+    labels = [{k: slugs[k][v] for k, v in keys.items()} for keys in group_keys]
+    names = [stem.format(**label) for label in labels]
+    clash = [name for name, count in Counter(names).items() if count > 1]
+    if clash:
+        raise ValueError(f"file name pattern {stem!r} maps several groups to {clash[0]!r}")
+
+    written = unchanged = 0
+    for keys, label, name, idx in zip(group_keys, labels, names, groups.values()):
+        outputs = {
+            out_dir / f"{name}.tex": render_latex(body[idx], template, labels=label, **keys),
+            out_dir / f"{name}.csv": csv_frame.iloc[idx].to_csv(index=False, lineterminator="\n"),
+        }
+        for path, text in outputs.items():
+            if write_if_changed(path, text):
+                written += 1
+            else:
+                unchanged += 1
+    return written, unchanged
@@ -0,0 +1,15 @@
+"""Pytest configuration: make the ``src`` scripts importable by bare name.
+
+The scripts under ``src/`` import each other as top-level modules (they are
+run as ``python src/<script>.py``), so the directory has to be on ``sys.path``
+for ``from src.<module> import ...`` to resolve their imports.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
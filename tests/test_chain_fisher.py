@@ -28,6 +28,21 @@ class ChainFisherTest(unittest.TestCase):
         self.assertEqual(result["IPD"].iloc[0], 1.0)
         self.assertAlmostEqual(result["IPD"].iloc[1], 0.5)
 
+    def test_ignores_rows_without_family(self) -> None:
+        """Rows with a blank family must not leak into another family's cell."""
+
+        data = pd.DataFrame(
+            {
+                "date": ["2025-01-01", "2025-01-01", "2025-06-01", "2025-06-01", "2025-06-01"],
+                "family": ["qa", "code", "qa", "code", None],
+                "LCI": [2.0, 4.0, 1.0, 2.0, 100.0],
+            }
+        )
+        result = chain_fisher(data)
+
+        self.assertAlmostEqual(result["IPD"].iloc[1], 0.5)
+        self.assertTrue(chain_fisher(data.assign(family=None)).empty)
+
     def test_carries_forward_without_overlap(self) -> None:
         """When no overlapping families exist, the index should stay flat."""
 
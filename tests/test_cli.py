@@ -0,0 +1,68 @@
+"""Tests for the ``lci`` command-line entry point and its startup cost."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.lci import build_parser
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Budget for importing the CLI and dispatching a light subcommand. Importing
+# pandas alone costs several hundred milliseconds, so this also catches an
+# accidental eager import of the scientific stack.
+IMPORT_BUDGET_MS = 150
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import lci
+lci.main(["integrate", "--templates"])
+elapsed_ms = (time.perf_counter() - start) * 1000.0
+print(json.dumps({"ms": elapsed_ms, "heavy": [m for m in %r if m in sys.modules]}))
+"""
+
+
+class CliStartupTest(unittest.TestCase):
+    """The template subcommand must start without the scientific stack."""
+
+    def test_templates_within_import_budget(self) -> None:
+        """Writing schema templates stays under the import-time budget."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            proc = subprocess.run(
+                [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+                cwd=tmp,
+                env={"PYTHONPATH": str(SRC)},
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            self.assertTrue((Path(tmp) / "data" / "evals" / "accuracy_schema.csv").exists())
+
+        probe = json.loads(proc.stdout.strip().splitlines()[-1])
+        self.assertEqual(probe["heavy"], [])
+        self.assertLess(probe["ms"], IMPORT_BUDGET_MS)
+
+    def test_requires_subcommand(self) -> None:
+        """Running without a subcommand is a usage error."""
+
+        with self.assertRaises(SystemExit):
+            build_parser().parse_args([])
+
+    def test_ipd_weight_column(self) -> None:
+        """``ipd --weight`` names the decomposition weight column."""
+
+        args = build_parser().parse_args(["ipd", "--weight", "volume"])
+        self.assertEqual(args.weight, "volume")
+        self.assertIsNone(build_parser().parse_args(["ipd", "--decompose"]).weight)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    unittest.main()
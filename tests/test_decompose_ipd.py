@@ -0,0 +1,116 @@
+"""Unit tests for the IPD change decomposition."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.make_ipd import chain_fisher, decompose_ipd
+
+TERMS = ["within", "share_shift", "entry", "exit"]
+LINK_TERMS = TERMS + ["fisher_gap"]
+
+
+class DecomposeIpdTest(unittest.TestCase):
+    """Validate the within/share-shift/entry/exit split of each link."""
+
+    def test_terms_sum_to_level_change_with_churn(self) -> None:
+        """The four contributions must add up to the level change."""
+
+        rng = np.random.default_rng(1)
+        rows = [
+            (f"2025-{month:02d}-01", f"f{fam}", rng.uniform(1e-6, 1e-5), rng.uniform(0.5, 2.0))
+            for month in range(1, 13)
+            for fam in range(40)
+            if rng.random() < 0.7
+        ]
+        data = pd.DataFrame(rows, columns=["date", "family", "LCI", "w"])
+
+        for weight in (None, "w"):
+            result = decompose_ipd(data, weight=weight)
+            self.assertEqual(len(result), 11)
+            np.testing.assert_allclose(
+                result[TERMS].sum(axis=1), result["level_change"], atol=1e-12
+            )
+            np.testing.assert_allclose(
+                result[LINK_TERMS].sum(axis=1), result["log_ipd_link"], atol=1e-12
+            )
+        ipd = chain_fisher(data)["IPD"].to_numpy()
+        np.testing.assert_allclose(
+            decompose_ipd(data)["log_ipd_link"], np.diff(np.log(ipd)), atol=1e-12
+        )
+        self.assertTrue((decompose_ipd(data)["share_shift"].abs() < 1e-12).all())
+
+    def test_fisher_gap_on_continuing_families(self) -> None:
+        """Without turnover the gap is Fisher minus the geometric mean."""
+
+        data = pd.DataFrame(
+            {
+                "date": ["2025-01-01"] * 3 + ["2025-06-01"] * 3,
+                "family": ["qa", "code", "summ"] * 2,
+                "LCI": [1.0, 1.0, 1.0, 2.0, 0.5, 0.1],
+            }
+        )
+        row = decompose_ipd(data).iloc[0]
+        ipd = chain_fisher(data)["IPD"].iloc[1]
+
+        self.assertAlmostEqual(row["within"], np.log([2.0, 0.5, 0.1]).mean())
+        self.assertAlmostEqual(row["log_ipd_link"], np.log(ipd))
+        self.assertAlmostEqual(row["fisher_gap"], np.log(ipd) - row["within"])
+
+    def test_entry_and_exit(self) -> None:
+        """Entrants and exiters are counted and priced against survivors."""
+
+        data = pd.DataFrame(
+            {
+                "date": ["2025-01-01", "2025-01-01", "2025-06-01", "2025-06-01"],
+                "family": ["qa", "code", "qa", "summ"],
+                "LCI": [1.0, 4.0, 1.0, np.e],
+            }
+        )
+        row = decompose_ipd(data).iloc[0]
+
+        self.assertEqual(
+            (row["n_continuing"], row["n_entering"], row["n_exiting"]), (1, 1, 1)
+        )
+        self.assertAlmostEqual(row["within"], 0.0)
+        self.assertAlmostEqual(row["entry"], 0.5)
+        self.assertAlmostEqual(row["exit"], -0.5 * np.log(4.0))
+        self.assertAlmostEqual(row["log_ipd_link"], 0.0)
+        self.assertAlmostEqual(row[LINK_TERMS].sum(), 0.0)
+
+    def test_missing_weight_drops_only_that_row(self) -> None:
+        """A NaN weight removes its family, not the whole date."""
+
+        data = pd.DataFrame(
+            {
+                "date": ["2025-01-01"] * 3 + ["2025-06-01"] * 3,
+                "family": ["qa", "code", "summ"] * 2,
+                "LCI": [1.0, 2.0, 4.0, 1.0, 8.0, 4.0],
+                "w": [1.0, np.nan, 1.0, 1.0, 1.0, 1.0],
+            }
+        )
+        row = decompose_ipd(data, weight="w").iloc[0]
+
+        self.assertEqual(
+            (row["n_continuing"], row["n_entering"], row["n_exiting"]), (2, 1, 0)
+        )
+        self.assertTrue(np.isfinite(row[TERMS].to_numpy(dtype=float)).all())
+        self.assertAlmostEqual(row["entry"], (np.log(8.0) - np.log(4.0) / 2) / 3)
+
+    def test_no_overlap_is_all_entry(self) -> None:
+        """Without continuing families the whole change is turnover."""
+
+        data = pd.DataFrame(
+            {"date": ["2025-01-01", "2025-06-01"], "family": ["qa", "code"], "LCI": [3.0, 6.0]}
+        )
+        row = decompose_ipd(data).iloc[0]
+
+        self.assertAlmostEqual(row["entry"], np.log(2.0))
+        self.assertAlmostEqual(row["within"] + row["exit"], 0.0)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    unittest.main()
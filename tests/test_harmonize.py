@@ -0,0 +1,91 @@
+"""Unit tests for the benchmark harmonization stage."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.harmonize import aggregate_seeds, harmonize, pair_digests, refresh
+
+
+def _raw() -> pd.DataFrame:
+    rows = []
+    # Reference protocol: 5-shot instruct, the widest coverage; m1 has two seeds.
+    for model, value in [("m1", 0.70), ("m2", 0.60), ("m3", 0.50), ("m4", 0.40), ("m7", 0.30)]:
+        rows.append((model, "mmlu", 5, "instruct", value, 0))
+    rows.append(("m1", "mmlu", 5, "instruct", 0.72, 1))
+    # 0-shot base: three paired models 0.1 below reference, plus m5 alone.
+    for model, value in [("m1", 0.61), ("m2", 0.50), ("m3", 0.40), ("m5", 0.30)]:
+        rows.append((model, "mmlu", 0, "base", value, 0))
+    # 1-shot base: a single paired model, too few to adjust.
+    rows += [("m1", "mmlu", 1, "base", 0.65, 0), ("m6", "mmlu", 1, "base", 0.45, 0)]
+    frame = pd.DataFrame(rows, columns=["model", "dataset", "shots", "variant", "value", "seed"])
+    return frame.assign(
+        family="Open", split="val", metric="acc@1", timestamp="2025-10-06T10:15:00Z"
+    )
+
+
+class HarmonizeTest(unittest.TestCase):
+    """Validate protocol keys, adjustment rules and incremental refresh."""
+
+    def test_infers_protocol_from_names(self) -> None:
+        """Shots come from N-shot tags and variants from model names."""
+
+        raw = _raw().drop(columns=["shots", "variant"]).iloc[:2]
+        raw["model"] = ["m1-instruct", "m2"]
+        raw["metric"] = ["acc_5shot", "acc@1"]
+        records = aggregate_seeds(raw)
+
+        self.assertEqual(records["shots"].tolist(), [5, -1])
+        self.assertEqual(records["variant"].tolist(), ["instruct", "base"])
+
+    def test_adjusts_rejects_and_supersedes(self) -> None:
+        """Each non-reference score is adjusted, superseded or rejected."""
+
+        out = harmonize(aggregate_seeds(_raw())).set_index(["model", "shots"])
+
+        self.assertAlmostEqual(out.loc[("m1", 5), "value"], 0.71)
+        self.assertEqual(out.loc[("m1", 5), "n_seeds"], 2)
+        self.assertEqual(out.loc[("m1", 0), "status"], "superseded")
+        self.assertEqual(out.loc[("m5", 0), "status"], "adjusted")
+        self.assertAlmostEqual(out.loc[("m5", 0), "value_harmonized"], 0.30 + 0.10)
+        self.assertEqual(out.loc[("m6", 1), "status"], "rejected")
+        self.assertTrue(pd.isna(out.loc[("m6", 1), "value_harmonized"]))
+
+    def test_refresh_processes_only_new_pairs(self) -> None:
+        """A refresh hashes appended rows and re-aggregates their pairs only."""
+
+        raw = _raw()
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = (Path(tmp) / "index.csv", Path(tmp) / "records.csv")
+
+            _, processed = refresh(raw, *paths)
+            self.assertEqual(processed, 7)
+            _, processed = refresh(raw, *paths)
+            self.assertEqual(processed, 0)
+
+            grown = pd.concat([raw, raw.iloc[[0]].assign(seed=2, value=0.74)], ignore_index=True)
+            records, processed = refresh(grown, *paths)
+            self.assertEqual(processed, 1)
+            pd.testing.assert_frame_equal(
+                pd.read_csv(paths[0], dtype={"model": str, "dataset": str}), pair_digests(grown)
+            )
+
+            # Edits before the watermark are only picked up by a full rehash.
+            edited = grown.assign(value=grown["value"].where(grown["model"] != "m6", 0.5))
+            self.assertEqual(refresh(edited, *paths)[1], 0)
+            self.assertEqual(refresh(edited, *paths, full=True)[1], 1)
+            records, processed = refresh(grown, *paths, full=True)
+            self.assertEqual(processed, 1)
+
+        expected = aggregate_seeds(grown)
+        pd.testing.assert_frame_equal(
+            records[expected.columns].reset_index(drop=True), expected, check_dtype=False
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    unittest.main()
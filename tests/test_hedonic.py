@@ -0,0 +1,119 @@
+"""Unit tests for the time-dummy hedonic regression."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.hedonic import HedonicDesign, hedonic_index
+
+
+def _panel(n: int = 600, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = np.array(["2025-01-01", "2025-04-01", "2025-07-01"])
+    date_idx = rng.integers(0, 3, n)
+    panel = pd.DataFrame(
+        {
+            "date": dates[date_idx],
+            "family": rng.choice(["QA", "Code", "Summ"], n),
+            "region": rng.choice(["us-east", "eu-west"], n),
+            "model": rng.choice([f"m{i}" for i in range(30)], n),
+            "a": rng.uniform(0.5, 0.95, n),
+            "p95_ms": rng.uniform(200, 900, n),
+        }
+    )
+    log_price = (
+        -11.0
+        + np.array([0.0, -0.2, -0.5])[date_idx]
+        + 1.5 * panel["a"]
+        - 0.001 * panel["p95_ms"]
+        + rng.normal(0, 0.05, n)
+    )
+    panel["price_per_token_usd"] = np.exp(log_price)
+    return panel
+
+
+def _dense(design: HedonicDesign) -> np.ndarray:
+    return design.X.toarray()
+
+
+class HedonicTest(unittest.TestCase):
+    """Validate estimates, robust errors and factor reuse."""
+
+    def test_recovers_time_effects(self) -> None:
+        """Date dummies recover the simulated log price path."""
+
+        index, fit = hedonic_index(_panel())
+
+        np.testing.assert_allclose(
+            np.log(index["IPD_hedonic"]), [0.0, -0.2, -0.5], atol=0.02
+        )
+        coef = dict(zip(fit.names, fit.coef))
+        self.assertAlmostEqual(coef["a"], 1.5, delta=0.05)
+        self.assertEqual(fit.n_clusters, 30)
+
+    def test_matches_dense_least_squares(self) -> None:
+        """Coefficients and CR1 errors match a dense reference computation."""
+
+        panel = _panel()
+        design = HedonicDesign(panel)
+        y = design.outcome(panel)
+        fit = design.fit(y)
+
+        X = _dense(design)
+        beta, *_ = np.linalg.lstsq(X, y, rcond=None)
+        np.testing.assert_allclose(fit.coef, beta, rtol=1e-8, atol=1e-10)
+
+        n, k = X.shape
+        resid = y - X @ beta
+        bread = np.linalg.inv(X.T @ X)
+        clusters = pd.factorize(panel["model"])[0]
+        scores = np.zeros((clusters.max() + 1, k))
+        np.add.at(scores, clusters, X * resid[:, None])
+        g = len(scores)
+        cov = g / (g - 1) * (n - 1) / (n - k) * bread @ scores.T @ scores @ bread
+        np.testing.assert_allclose(fit.se, np.sqrt(np.diag(cov)), rtol=1e-8)
+
+    def test_reuses_factor_for_new_outcome(self) -> None:
+        """Refitting another outcome on the same design solves it exactly."""
+
+        panel = _panel()
+        design = HedonicDesign(panel)
+        y2 = design.outcome(panel) * 2.0 + 1.0
+        beta, *_ = np.linalg.lstsq(_dense(design), y2, rcond=None)
+
+        np.testing.assert_allclose(design.fit(y2).coef, beta, rtol=1e-8, atol=1e-10)
+
+    def test_drops_rows_without_cluster_key(self) -> None:
+        """Rows with a blank cluster key are excluded, not a crash."""
+
+        panel = _panel()
+        panel.loc[[0, 5], "model"] = np.nan
+        design = HedonicDesign(panel)
+        fit = design.fit(design.outcome(panel))
+
+        self.assertEqual(fit.n_obs, len(panel) - 2)
+        self.assertTrue(np.isfinite(fit.se).all())
+        with self.assertRaises(ValueError):
+            design.fit(np.log(panel["price_per_token_usd"].to_numpy()))
+
+    def test_aliased_characteristic_is_dropped(self) -> None:
+        """A characteristic collinear with earlier columns gets NaN."""
+
+        panel = _panel()
+        panel["q"] = 2.0 * panel["a"]
+        panel["s"] = 0.99
+        design = HedonicDesign(panel)
+        fit = design.fit(design.outcome(panel))
+        coef = dict(zip(fit.names, fit.coef))
+
+        self.assertEqual(design.aliased, ["q"])
+        self.assertEqual(design.dropped, ["s"])
+        self.assertTrue(np.isnan(coef["q"]))
+        self.assertAlmostEqual(coef["a"], 1.5, delta=0.05)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Unit tests for the compact panel representation."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.generate_demo_results import compute_lci_by_family, demo_dataframe
+from src.make_ipd import chain_fisher
+from src.panel import MISSING_DAY, compact_panel, day_numbers, decode_panel, memory_bytes
+
+
+def _raw_panel(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2023-01-01", periods=50, freq="W").strftime("%Y-%m-%d")
+    frame = pd.DataFrame(
+        {
+            "date": rng.choice(np.asarray(dates, dtype=object), n),
+            "family": rng.choice(["QA", "Code", "Summarization"], n).astype(object),
+            "provider": rng.choice(["OpenAI", "Anthropic", "Cohere"], n).astype(object),
+            "model": np.asarray([f"model-{i % 200}" for i in range(n)], dtype=object),
+            "region": rng.choice(["us-east", "us-west", "eu-west"], n).astype(object),
+        }
+    )
+    for col in ("a", "p50_ms", "p95_ms", "q", "s", "tokens_per_sec", "ops_pct"):
+        frame[col] = rng.random(n)
+    frame["price_per_token_usd"] = rng.random(n) * 1e-5
+    return frame
+
+
+class CompactPanelTest(unittest.TestCase):
+    """Validate encoding, round-tripping and the memory footprint."""
+
+    def test_encodes_keys_and_dates(self) -> None:
+        """Keys become categoricals and dates int64 day numbers."""
+
+        panel = compact_panel(
+            pd.DataFrame(
+                {
+                    "date": ["2025-01-01", "not a date"],
+                    "family": ["QA", "Code"],
+                    "a": [0.8, 0.7],
+                    "price_per_token_usd": [1e-5, 2e-5],
+                }
+            )
+        )
+
+        self.assertIsInstance(panel["family"].dtype, pd.CategoricalDtype)
+        self.assertEqual(panel["date"].dtype, np.int64)
+        self.assertEqual(panel["date"].iloc[1], MISSING_DAY)
+        self.assertEqual(panel["a"].dtype, np.float64)
+        self.assertEqual(panel["price_per_token_usd"].dtype, np.float64)
+        self.assertEqual(decode_panel(panel)["date"].iloc[0], "2025-01-01")
+
+    def test_integer_dates(self) -> None:
+        """Integer dates are day numbers or YYYYMMDD; anything else is refused."""
+
+        days = day_numbers(pd.Series([20089, MISSING_DAY]))
+        self.assertEqual(days.tolist(), [20089, MISSING_DAY])
+
+        panel = compact_panel(pd.DataFrame({"date": [20250101, 20251301]}))
+        self.assertEqual(panel["date"].tolist(), [20089, MISSING_DAY])
+        self.assertEqual(decode_panel(panel)["date"].iloc[0], "2025-01-01")
+
+        with self.assertRaises(ValueError):
+            day_numbers(pd.Series([123456]))
+
+    def test_resident_size_shrinks(self) -> None:
+        """A realistic panel should be at least five times smaller."""
+
+        raw = _raw_panel(20_000)
+        self.assertGreaterEqual(memory_bytes(raw) / memory_bytes(compact_panel(raw)), 5.0)
+
+    def test_demo_outputs_match_baseline(self) -> None:
+        """Compaction must not move the published demo LCI/IPD values."""
+
+        panel = compact_panel(demo_dataframe().assign(accuracy=lambda d: d["a"]))
+        by_family = compute_lci_by_family(panel)
+
+        np.testing.assert_allclose(
+            by_family["LCI"],
+            [
+                1.2e-05,
+                1.25e-05,
+                1.877905911446284e-05,
+                1.103896103896104e-05,
+                1.1585365853658537e-05,
+                1.5877132402714708e-05,
+            ],
+            rtol=1e-15,
+        )
+        np.testing.assert_allclose(
+            chain_fisher(by_family)["IPD"], [1.0, 0.8966260842330473], rtol=1e-14
+        )
+
+    def test_chain_fisher_matches_raw_input(self) -> None:
+        """The IPD must not depend on which representation is passed in."""
+
+        raw = pd.DataFrame(
+            {
+                "date": ["2025-01-01", "2025-01-01", "2025-06-01", "2025-06-01"],
+                "family": ["qa", "code", "qa", "code"],
+                "LCI": [2.0, 4.0, 1.0, 3.0],
+            }
+        )
+        expected = chain_fisher(raw)
+        result = chain_fisher(compact_panel(raw))
+
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(raw["date"].iloc[0], "2025-01-01")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Unit tests for the batch table exporter."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.panel import compact_panel
+from src.table_export import (
+    LCI_BY_FAMILY,
+    LCI_BY_FAMILY_AT_DATE,
+    LCI_FAMILY_HISTORY,
+    export_grouped,
+    render_table,
+)
+
+
+def _by_family() -> pd.DataFrame:
+    return compact_panel(
+        pd.DataFrame(
+            {
+                "date": ["2025-01-01", "2025-01-01", "2025-06-01"],
+                "family": ["QA", "R&D_ops", "QA"],
+                "LCI": [1.25e-05, 2.0e-05, 1.1e-05],
+                "accuracy": [0.8, 0.7, 0.82],
+                "p95_ms": [450.0, 600.0, 430.0],
+                "price_per_token_usd": [1e-05, 1.2e-05, 9.5e-06],
+            }
+        )
+    )
+
+
+class TableExportTest(unittest.TestCase):
+    """Validate rendering, grouping and incremental writes."""
+
+    def test_render_formats_and_escapes(self) -> None:
+        """Cells use the template formats and LaTeX specials are escaped."""
+
+        frame = _by_family()
+        frame["family"] = frame["family"].cat.add_categories(["a\\b~c^d{e}"])
+        frame.loc[2, "family"] = "a\\b~c^d{e}"
+        tex = render_table(frame, LCI_BY_FAMILY)
+
+        self.assertIn("QA & 1.25e-05 & 0.800 & 450 & 1.00e-05 \\\\", tex)
+        self.assertIn("R\\&D\\_ops & ", tex)
+        self.assertIn(
+            "a\\textbackslash{}b\\textasciitilde{}c\\textasciicircum{}d\\{e\\} & ", tex
+        )
+        self.assertTrue(tex.endswith("\\end{table}\n"))
+
+    def test_group_keys_escaped_in_caption_and_label(self) -> None:
+        """Group keys are escaped in captions and slugged in labels."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            export_grouped(
+                _by_family(), LCI_FAMILY_HISTORY, ("family",), out, "lci_history_{family}"
+            )
+            tex = (out / "lci_history_R_D_ops.tex").read_text(encoding="utf-8")
+
+        self.assertIn("\\caption{LCI history for R\\&D\\_ops (demo)}", tex)
+        self.assertIn("\\label{tab:lci_history_R_D_ops}", tex)
+
+    def test_colliding_slugs_get_stable_suffixes(self) -> None:
+        """Keys with the same slug get distinct, run-independent file names."""
+
+        frame = _by_family()
+        frame["family"] = frame["family"].cat.rename_categories(
+            {"QA": "R_D_ops", "R&D_ops": "R&D ops"}
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            args = (LCI_FAMILY_HISTORY, ("family",), out, "lci_history_{family}")
+
+            self.assertEqual(export_grouped(frame, *args), (4, 0))
+            names = sorted(path.name for path in out.iterdir())
+            self.assertEqual(export_grouped(frame, *args), (0, 4))
+            labels = {
+                path.read_text(encoding="utf-8").split("\\label{")[1].split("}")[0]
+                for path in out.glob("*.tex")
+            }
+            with self.assertRaises(ValueError):
+                export_grouped(frame, LCI_FAMILY_HISTORY, ("family",), out, "lci_history")
+
+        self.assertEqual(len(names), 4)
+        self.assertTrue(all(name.startswith("lci_history_R_D_ops-") for name in names))
+        self.assertEqual(len(labels), 2)
+
+    def test_csv_groups_survive_embedded_newlines(self) -> None:
+        """A quoted newline in one group does not shift another group's rows."""
+
+        frame = _by_family()
+        frame["family"] = frame["family"].cat.rename_categories({"R&D_ops": "R&D\nops"})
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            export_grouped(frame, LCI_BY_FAMILY_AT_DATE, ("date",), out, "t_{date}")
+            later = pd.read_csv(out / "t_2025-06-01.csv")
+            earlier = pd.read_csv(out / "t_2025-01-01.csv")
+
+        self.assertEqual(later["family"].tolist(), ["QA"])
+        self.assertEqual(sorted(earlier["family"]), ["QA", "R&D\nops"])
+
+    def test_grouped_export_writes_only_changes(self) -> None:
+        """One table pair per group; unchanged files are not rewritten."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            args = (LCI_BY_FAMILY_AT_DATE, ("date",), out, "lci_by_family_{date}")
+
+            self.assertEqual(export_grouped(_by_family(), *args), (4, 0))
+            csv = (out / "lci_by_family_2025-01-01.csv").read_text(encoding="utf-8")
+            self.assertEqual(
+                csv.splitlines()[0], "date,family,LCI,accuracy,p95_ms,price_per_token_usd"
+            )
+            self.assertEqual(len(csv.splitlines()), 3)
+            self.assertIn(
+                "\\label{tab:lci_by_family_2025-06-01}",
+                (out / "lci_by_family_2025-06-01.tex").read_text(encoding="utf-8"),
+            )
+
+            self.assertEqual(export_grouped(_by_family(), *args), (0, 4))
+            changed = _by_family()
+            changed.loc[2, "LCI"] = 1.0e-05
+            self.assertEqual(export_grouped(changed, *args), (2, 2))
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    unittest.main()